@@ -1,44 +1,74 @@
+import selectors
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, Queue
+from threading import Thread, Timer
 
-from .audio_utils import load_audio
+import numpy as np
+
+from .llm import DEFAULT_SYSTEM_PROMPT, HailoLLM, stream_to_terminal
 from .pipeline import HailoWhisperPipeline, create_shared_vdevice, get_hef_paths
 from .postprocessing import clean_transcription
 from .preprocessing import improve_input_audio, preprocess
 from .record_utils import record_audio
+from .spinner import SPINNER_CHARS, loading
 
 GREEN = "\033[32m"
 RESET = "\033[0m"
 
 
-def run(variant, hw_arch, duration, boost_words, chat_opts=None):
-    from .spinner import loading
+def _read_line(prompt):
+    """Prompt and read one line without parking the main thread in a read(2).
+
+    Waits for stdin readiness in short select() slices instead of blocking
+    in input(), so background work (the sentence speaker finishing the
+    previous reply, the recording warmup) keeps draining and Ctrl-C is
+    handled promptly while the user thinks. Raises EOFError on closed
+    stdin, matching input()."""
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    with selectors.DefaultSelector() as selector:
+        selector.register(sys.stdin, selectors.EVENT_READ)
+        while not selector.select(timeout=0.1):
+            pass
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.strip()
+
 
+def run(variant, hw_arch, duration, boost_words, chat_opts=None):
     encoder_path, decoder_path = get_hef_paths(variant, hw_arch)
 
     llm = None
     vdevice = None
+    executor = ThreadPoolExecutor(max_workers=2)
 
     if chat_opts:
-        from .llm import HailoLLM
-
         vdevice = loading("Hailo device", create_shared_vdevice)
+    # The Whisper HEF load runs on the executor and is only awaited at
+    # first use (or shutdown) — a Future caches its result, so every
+    # .result() after the first returns instantly. The prompt appears
+    # while Whisper is still loading, and the remaining load time hides
+    # behind the user's think-time and the first recording.
+    pipeline_future = executor.submit(
+        HailoWhisperPipeline,
+        encoder_path,
+        decoder_path,
+        variant,
+        boost_words=boost_words,
+        vdevice=vdevice,
+    )
+    if chat_opts:
         llm = loading(
             f"LLM ({chat_opts['llm_model']})",
             lambda: HailoLLM(vdevice, chat_opts["llm_model"]),
         )
 
-    pipeline = loading(
-        f"Whisper ({variant})",
-        lambda: HailoWhisperPipeline(
-            encoder_path, decoder_path, variant, boost_words=boost_words, vdevice=vdevice
-        ),
-    )
-
-    chunk_length = pipeline.get_model_input_audio_length()
     audio_path = "/tmp/talk_recording.wav"
     chat_history = []
     last_response = None
+    warmed = False
 
     try:
         while True:
@@ -49,7 +79,7 @@ def run(variant, hw_arch, duration, boost_words, chat_opts=None):
             opts.append("'q' to quit")
             prompt = f"\nPress Enter to record, {', '.join(opts)}: "
 
-            user_input = input(prompt).strip().lower()
+            user_input = _read_line(prompt).lower()
             if user_input == "q":
                 break
             if user_input == "r" and tts and last_response:
@@ -57,14 +87,26 @@ def run(variant, hw_arch, duration, boost_words, chat_opts=None):
                 continue
 
             if user_input == "w":
-                transcription = input(f"{GREEN}>>> ").strip()
+                transcription = _read_line(f"{GREEN}>>> ")
                 sys.stdout.write(RESET)
                 if not transcription:
                     continue
             else:
-                record_audio(duration, audio_path)
-
-                audio = load_audio(audio_path)
+                # Record on a background thread so the NPU isn't idle while
+                # the user speaks — any remaining Whisper load plus the
+                # one-time warmup inference run in parallel, their cost
+                # hidden behind the recording.
+                record_future = executor.submit(record_audio, duration, audio_path)
+                pipeline = pipeline_future.result()
+                chunk_length = pipeline.get_model_input_audio_length()
+                if not warmed:
+                    _warm_up(pipeline, chunk_length)
+                    warmed = True
+                # record_audio hands back the 16 kHz float32 samples it just
+                # captured; re-reading the WAV it wrote (an ffmpeg subprocess
+                # plus an int16 round trip) would only lose precision. The
+                # file on disk remains as a debugging artifact.
+                audio = record_future.result()
                 audio, start_time = improve_input_audio(audio, vad=True)
 
                 if start_time is None:
@@ -79,10 +121,23 @@ def run(variant, hw_arch, duration, boost_words, chat_opts=None):
                     chunk_offset=chunk_offset,
                 )
 
+                # Submit chunks as preprocessing yields them, so the NPU
+                # starts on the first chunk while later ones are still
+                # being converted, then collect the results in order.
+                pending = 0
                 for mel in mel_spectrograms:
                     pipeline.send_data(mel)
-                    time.sleep(0.1)
-                    transcription = clean_transcription(pipeline.get_transcription())
+                    pending += 1
+
+                transcription = ""
+                for _ in range(pending):
+                    try:
+                        transcription = clean_transcription(
+                            pipeline.get_transcription(timeout=duration + 1)
+                        )
+                    except Empty:
+                        print("Transcription timed out. Try again.")
+                        continue
                     print(f"\n{GREEN}>>> {transcription}{RESET}")
 
             if llm and transcription:
@@ -91,9 +146,10 @@ def run(variant, hw_arch, duration, boost_words, chat_opts=None):
     except KeyboardInterrupt:
         print("\nInterrupted.")
     finally:
+        executor.shutdown(wait=False)
 
         def _shutdown():
-            pipeline.stop()
+            pipeline_future.result().stop()
             if llm:
                 llm.release()
             if vdevice:
@@ -105,40 +161,108 @@ def run(variant, hw_arch, duration, boost_words, chat_opts=None):
         loading("shutdown", _shutdown, spin_message="Shutting down...", done_message="Done.")
 
 
+def _warm_up(pipeline, chunk_length):
+    """Push one silent mel through the pipeline to warm up the NPU.
+
+    The first inference after a HEF load is noticeably slower; doing it
+    while the first recording is still in progress keeps that cold start
+    off the interactive path. Low-amplitude noise rather than zeros, so
+    the pipeline's silence gate doesn't skip the inference being warmed.
+    """
+    shape = (1, 1, chunk_length * 100, 80)
+    noise = np.random.default_rng(0).normal(scale=0.1, size=shape).astype(np.float32)
+    pipeline.send_data(noise)
+    pipeline.get_transcription()
+
+
+def _show_thinking():
+    sys.stdout.write(f"\r{SPINNER_CHARS[0]} Thinking...")
+    sys.stdout.flush()
+
+
 def _chat_respond(transcription, llm, chat_opts, history):
     """Send transcription to LLM, stream response, and optionally speak it."""
-    from .llm import DEFAULT_SYSTEM_PROMPT, stream_to_terminal
-    from .spinner import spinner
-
     history.append({"role": "user", "content": transcription})
     system_prompt = chat_opts["system_prompt"] or DEFAULT_SYSTEM_PROMPT
+    tts = chat_opts["tts"]
+    speaker = _SentenceSpeaker(tts) if tts else None
 
-    done, thread = spinner("Thinking...")
+    # Defer the "Thinking..." indicator: if the first token arrives within
+    # 500 ms no thread is ever spawned, keeping thread startup and join
+    # overhead off the time-to-first-token path.
+    thinking = Timer(0.5, _show_thinking)
+    thinking.start()
     first_token = True
 
     def token_stream():
         nonlocal first_token
         for token in llm.chat(history, system_prompt):
             if first_token:
-                done.set()
-                thread.join()
-                sys.stdout.write("\n")
+                thinking.cancel()
+                sys.stdout.write("\r\033[K\n")
                 first_token = False
+            if speaker:
+                speaker.feed(token)
             yield token
+        if speaker:
+            speaker.flush()
 
     try:
         response = stream_to_terminal(token_stream())
     except Exception as e:
-        done.set()
-        thread.join()
+        thinking.cancel()
+        sys.stdout.write("\r\033[K")
+        if speaker:
+            speaker.finish()
         print(f"\nLLM error: {e}")
         history.pop()
         return None
 
     history.append({"role": "assistant", "content": response})
 
-    tts = chat_opts["tts"]
-    if tts and response.strip():
-        tts.speak(response)
+    if speaker:
+        speaker.finish()
 
     return response
+
+
+class _SentenceSpeaker:
+    """Speak a token stream sentence by sentence on a background thread.
+
+    Each completed sentence is queued for TTS as soon as its terminator
+    arrives, so the first sentence starts playing while the LLM is still
+    generating the rest of the response. A single worker thread serializes
+    the speak() calls so sentences never overlap.
+    """
+
+    _TERMINATORS = (".", "!", "?")
+
+    def __init__(self, tts):
+        self._tts = tts
+        self._queue = Queue()
+        self._buf = []
+        self._thread = Thread(target=self._speak_worker, daemon=True)
+        self._thread.start()
+
+    def _speak_worker(self):
+        while True:
+            sentence = self._queue.get()
+            if sentence is None:
+                break
+            self._tts.speak(sentence)
+
+    def feed(self, token):
+        self._buf.append(token)
+        if token.rstrip().endswith(self._TERMINATORS) or "\n" in token:
+            self.flush()
+
+    def flush(self):
+        sentence = "".join(self._buf).strip()
+        self._buf.clear()
+        if sentence:
+            self._queue.put(sentence)
+
+    def finish(self):
+        """Wait until everything queued so far has been spoken."""
+        self._queue.put(None)
+        self._thread.join()
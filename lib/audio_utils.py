@@ -69,12 +69,17 @@ def mel_filters(device, n_mels: int) -> torch.Tensor:
         return torch.from_numpy(f[f"mel_{n_mels}"]).to(device)
 
 
-def log_mel_spectrogram(
+def mel_power_spectrogram(
     audio: Union[str, np.ndarray, torch.Tensor],
     n_mels: int = 80,
     padding: int = 0,
     device: Optional[Union[str, torch.device]] = None,
 ):
+    """Compute the mel-scale power spectrogram, without log scaling.
+
+    Split out from log_mel_spectrogram so callers can run the STFT once
+    over a long signal and log-normalize frame slices of it separately.
+    """
     if not torch.is_tensor(audio):
         if isinstance(audio, str):
             audio = load_audio(audio)
@@ -87,8 +92,20 @@ def log_mel_spectrogram(
     stft = torch.stft(audio, N_FFT, HOP_LENGTH, window=window, return_complex=True)
     magnitudes = stft[..., :-1].abs() ** 2
     filters = mel_filters(audio.device, n_mels)
-    mel_spec = filters @ magnitudes
+    return filters @ magnitudes
+
+
+def log_normalize(mel_spec: torch.Tensor) -> torch.Tensor:
+    """Whisper's log scaling, normalized against the input's own maximum."""
     log_spec = torch.clamp(mel_spec, min=1e-10).log10()
     log_spec = torch.maximum(log_spec, log_spec.max() - 8.0)
-    log_spec = (log_spec + 4.0) / 4.0
-    return log_spec
+    return (log_spec + 4.0) / 4.0
+
+
+def log_mel_spectrogram(
+    audio: Union[str, np.ndarray, torch.Tensor],
+    n_mels: int = 80,
+    padding: int = 0,
+    device: Optional[Union[str, torch.device]] = None,
+):
+    return log_normalize(mel_power_spectrogram(audio, n_mels, padding, device))
@@ -1,14 +1,21 @@
 # Adapted from hailo-apps speech recognition
 import os
+import time
+from functools import lru_cache
 from queue import Empty, Queue
-from threading import Thread
+from threading import Event, Thread
 
 import numpy as np
 
-from .postprocessing import apply_repetition_penalty, apply_word_boost
+from .postprocessing import select_next_token
 
 MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "models")
 
+# Mel chunks whose variance falls below this are treated as silence and
+# answered without touching the NPU. Normalized log-mels of real speech sit
+# orders of magnitude above it; digital silence is exactly constant.
+SILENCE_MEL_VARIANCE = 1e-5
+
 # Map variant + hw_arch to HEF filenames
 HEF_REGISTRY = {
     "base": {
@@ -49,18 +56,75 @@ HEF_REGISTRY = {
 
 
 def get_hef_paths(variant: str, hw_arch: str) -> tuple:
+    return _resolve_hef_paths(variant, hw_arch, MODELS_DIR)
+
+
+@lru_cache(maxsize=16)
+def _resolve_hef_paths(variant, hw_arch, models_dir):
+    # Memoized: the registry lookup and existence stat()s never change
+    # within a session. Keyed on models_dir so a redirected model store
+    # isn't served stale paths, and raised lookups are not cached, so a
+    # missing-model error is re-checked if the files appear later.
     try:
         entry = HEF_REGISTRY[variant][hw_arch]
     except KeyError:
         raise FileNotFoundError(f"HEF not available for model '{variant}' on hardware '{hw_arch}'.")
-    encoder_path = os.path.join(MODELS_DIR, entry["encoder"])
-    decoder_path = os.path.join(MODELS_DIR, entry["decoder"])
+    encoder_path = os.path.join(models_dir, entry["encoder"])
+    decoder_path = os.path.join(models_dir, entry["decoder"])
     for path in (encoder_path, decoder_path):
         if not os.path.exists(path):
             raise FileNotFoundError(f"Model file not found: {path}")
     return encoder_path, decoder_path
 
 
+class _SpscRing:
+    """Lock-free single-producer single-consumer ring buffer for mel chunks.
+
+    send_data() is only ever called from the app thread and _inference_loop
+    is the only consumer, so plain integer head/tail indices are safe under
+    the GIL and each transfer skips the mutex a Queue would take. The Event
+    lets the consumer sleep until work arrives — and lets stop() wake it
+    immediately instead of waiting out a polling timeout.
+    """
+
+    def __init__(self, capacity=8):
+        self._slots = [None] * capacity
+        self._head = 0  # next write, advanced only by the producer
+        self._tail = 0  # next read, advanced only by the consumer
+        self._event = Event()
+
+    def put(self, item):
+        while self._head - self._tail >= len(self._slots):
+            # Full means the consumer is mid-utterance; at most a handful
+            # of chunks are ever in flight, so just back off briefly.
+            time.sleep(0.001)
+        self._slots[self._head % len(self._slots)] = item
+        self._head += 1
+        self._event.set()
+
+    def get_nowait(self):
+        if self._tail == self._head:
+            raise Empty
+        index = self._tail % len(self._slots)
+        item = self._slots[index]
+        self._slots[index] = None
+        self._tail += 1
+        if self._tail == self._head:
+            self._event.clear()
+            # The producer may have published between the check and the
+            # clear — re-set so its wakeup is never lost.
+            if self._tail != self._head:
+                self._event.set()
+        return item
+
+    def wait(self):
+        """Block until put() publishes an item or wake() is called."""
+        self._event.wait()
+
+    def wake(self):
+        self._event.set()
+
+
 def create_shared_vdevice():
     """Create a VDevice with shared scheduling for multi-model inference."""
     from hailo_platform import HailoSchedulingAlgorithm, VDevice
@@ -87,18 +151,20 @@ class HailoWhisperPipeline:
         self.decoding_sequence_length = None
         self.vdevice = vdevice
 
-        self.token_embedding_weight = self._load_token_embedding_weight()
+        self._quantize_token_embedding(self._load_token_embedding_weight())
         self.onnx_add_input = self._load_onnx_add_input()
         self.constant_output_0 = np.array([1])
         self._load_tokenizer()
+        self._detok_table = self._build_detok_table()
         self.boost_token_map = self._build_boost_token_map(boost_words or {})
+        self.boost_ids, self.boost_factors = self._build_boost_arrays()
 
         from hailo_platform import HEF
 
         encoder_hef = HEF(self.encoder_model_path)
         self.input_audio_length = int((encoder_hef.get_input_vstream_infos()[0].shape[1]) / 100)
 
-        self.data_queue = Queue()
+        self.data_queue = _SpscRing()
         self.results_queue = Queue()
         self.running = True
         self.thread = Thread(target=self._inference_loop)
@@ -109,14 +175,36 @@ class HailoWhisperPipeline:
             MODELS_DIR,
             f"decoder_assets/{self.variant}/decoder_tokenization/token_embedding_weight_{self.variant}.npy",
         )
-        return np.load(file_path)
+        # Memory-map instead of eagerly reading ~100 MB into RAM: the
+        # quantization pass streams through the map once and the pages are
+        # reclaimable immediately after, so startup never holds both the
+        # FP32 table and its int8 copy.
+        return np.load(file_path, mmap_mode="r")
+
+    def _quantize_token_embedding(self, weight):
+        """Store the embedding table as int8 plus a per-row float32 scale.
+
+        Decoding reads one table row per step, so the gather is pure memory
+        bandwidth; int8 cuts the resident table and cache pressure 4x for a
+        worst-case per-row error of half a quantization step (~0.4%).
+        """
+        scale = np.max(np.abs(weight), axis=1, keepdims=True) / 127.0
+        np.maximum(scale, 1e-12, out=scale)  # keep all-zero (padding) rows finite
+        self.token_embedding_i8 = np.round(weight / scale).astype(np.int8)
+        self.token_embedding_scale = scale.astype(np.float32)
+
+    def _embedding_row(self, token_id):
+        """Dequantize one embedding-table row back to float32."""
+        return self.token_embedding_i8[token_id] * self.token_embedding_scale[token_id]
 
     def _load_onnx_add_input(self):
         file_path = os.path.join(
             MODELS_DIR,
             f"decoder_assets/{self.variant}/decoder_tokenization/onnx_add_input_{self.variant}.npy",
         )
-        return np.load(file_path)
+        # Read-only and only indexed, never mutated — let the OS page in
+        # just the rows that are actually touched.
+        return np.load(file_path, mmap_mode="r")
 
     def _load_tokenizer(self):
         # Load from HuggingFace cache without network access to avoid timeout
@@ -130,6 +218,38 @@ class HailoWhisperPipeline:
             f"openai/whisper-{self.variant}", local_files_only=True
         )
 
+    def _build_detok_table(self):
+        """Precompute an id -> UTF-8 bytes table for detokenization.
+
+        tokenizer.decode() re-walks the byte-level BPE vocabulary on every
+        call; the vocabulary is fixed, so materialize the mapping once and
+        transcription becomes a bytes join. Special and timestamp tokens
+        map to b"", matching skip_special_tokens=True.
+        """
+        from transformers.models.gpt2.tokenization_gpt2 import bytes_to_unicode
+
+        byte_decoder = {char: byte for byte, char in bytes_to_unicode().items()}
+        special_ids = set(self.tokenizer.all_special_ids)
+        table = []
+        for token_id, token in enumerate(
+            self.tokenizer.convert_ids_to_tokens(list(range(len(self.tokenizer))))
+        ):
+            if token_id in special_ids:
+                table.append(b"")
+                continue
+            try:
+                table.append(bytes(byte_decoder[char] for char in token))
+            except KeyError:
+                # Added tokens fall outside the byte-level alphabet and
+                # never belong in a clean transcription.
+                table.append(b"")
+        return table
+
+    def _decode_tokens(self, token_ids):
+        table = self._detok_table
+        raw = b"".join(table[token] for token in token_ids if token < len(table))
+        return raw.decode("utf-8", errors="replace")
+
     def _build_boost_token_map(self, boost_words):
         token_map = {}
         for word, factor in boost_words.items():
@@ -138,8 +258,25 @@ class HailoWhisperPipeline:
                 token_map[tid] = factor
         return token_map
 
+    def _build_boost_arrays(self, special_token_start=50257):
+        """Turn the boost map into parallel id/factor arrays for fancy indexing."""
+        entries = sorted(
+            (tid, factor)
+            for tid, factor in self.boost_token_map.items()
+            if tid < special_token_start
+        )
+        if not entries:
+            return None, None
+        ids, factors = zip(*entries)
+        return np.asarray(ids, dtype=np.int64), np.asarray(factors, dtype=np.float32)
+
     def _tokenization(self, decoder_input_ids, add_embed=True):
-        gather_output = self.token_embedding_weight[decoder_input_ids]
+        # Note on the add_embed path: onnx_add_input is the positional
+        # embedding, so its rows differ per sequence position and cannot be
+        # folded into the [vocab, D] token table ahead of time. The
+        # streaming decode loop feeds raw token embeddings (add_embed=False
+        # semantics) and never takes this branch.
+        gather_output = self._embedding_row(decoder_input_ids)
         if add_embed:
             add_output = gather_output + self.onnx_add_input
             unsqueeze_output = np.expand_dims(add_output, axis=int(self.constant_output_0[0]))
@@ -185,89 +322,142 @@ class HailoWhisperPipeline:
                     encoder_bindings = encoder_configured_infer_model.create_bindings()
                     decoder_bindings = decoder_configured_infer_model.create_bindings()
 
+                    # Bindings keep a reference to the arrays they are given,
+                    # so every output buffer can be allocated and bound once
+                    # up front and reused for all utterances and decode steps
+                    # instead of allocating fresh np.zeros per step.
+                    encoded_features = np.empty(
+                        encoder_infer_model.output().shape, dtype=np.float32
+                    )
+                    encoder_bindings.output().set_buffer(encoded_features)
+
+                    # Pool of encoder (bindings, output buffer) slots, grown
+                    # on demand when several mel chunks are queued at once so
+                    # they can all be submitted in a single run() dispatch.
+                    encoder_slots = [(encoder_bindings, encoded_features)]
+
+                    def encoder_slot(index):
+                        while len(encoder_slots) <= index:
+                            bindings = encoder_configured_infer_model.create_bindings()
+                            output = np.empty(encoder_infer_model.output().shape, dtype=np.float32)
+                            bindings.output().set_buffer(output)
+                            encoder_slots.append((bindings, output))
+                        return encoder_slots[index]
+
+                    decoder_output_buffers = {
+                        name: np.empty(decoder_infer_model.output(name).shape, dtype=np.float32)
+                        for name in sorted_output_names
+                    }
+                    for name, buf in decoder_output_buffers.items():
+                        decoder_bindings.output(name).set_buffer(buf)
+
+                    # Only sequence position i of the logits is consumed at
+                    # decode step i, so gather just that row from each
+                    # split-vocab output into one preallocated buffer rather
+                    # than concatenating every layer's full (1, seq, w)
+                    # tensor per step.
+                    logit_slices = []
+                    vocab_offset = 0
+                    for name in useful_outputs:
+                        width = decoder_infer_model.output(name).shape[2]
+                        logit_slices.append((name, vocab_offset, vocab_offset + width))
+                        vocab_offset += width
+                    step_logits = np.empty((1, vocab_offset), dtype=np.float32)
+
+                    # The fixed-sequence decoder HEF consumes the full
+                    # (1, 1, seq, D) embedded token tensor every step, but
+                    # only one position changes per step. Keep one buffer
+                    # and write just the new token's embedding row each
+                    # iteration instead of re-gathering and re-embedding
+                    # every position (the KV-cache analogue available
+                    # without a separate prefill/incremental HEF pair).
+                    embedding_dim = self.token_embedding_i8.shape[1]
+                    token_embeddings = np.empty(
+                        (1, 1, self.decoding_sequence_length, embedding_dim), dtype=np.float32
+                    )
+                    decoder_bindings.input(f"{decoder_model_name}/input_layer2").set_buffer(
+                        token_embeddings
+                    )
+
                     while self.running:
-                        try:
-                            input_mel = self.data_queue.get(timeout=1)
-
-                            input_mel = np.ascontiguousarray(input_mel)
-                            encoder_bindings.input().set_buffer(input_mel)
-                            buffer = np.zeros(encoder_infer_model.output().shape).astype(np.float32)
-                            encoder_bindings.output().set_buffer(buffer)
-
-                            encoder_configured_infer_model.run([encoder_bindings], self.timeout_ms)
-                            encoded_features = encoder_bindings.output().get_buffer()
-
-                            start_token_id = [50258]
-                            decoder_input_ids = np.array([[start_token_id[0]]], dtype=np.int64)
-                            decoder_input_ids = np.concatenate(
-                                [
-                                    decoder_input_ids,
-                                    np.zeros(
-                                        (1, self.decoding_sequence_length - 1), dtype=np.int64
-                                    ),
-                                ],
-                                axis=1,
+                        # Sleep until the producer publishes a chunk; stop()
+                        # wakes us immediately via the ring's event.
+                        self.data_queue.wait()
+                        if not self.running:
+                            break
+
+                        # The app submits all chunks of an utterance before
+                        # collecting results, so drain whatever is already
+                        # queued and encode the batch in one dispatch
+                        # instead of one run() per chunk.
+                        mels = []
+                        while True:
+                            try:
+                                mels.append(self.data_queue.get_nowait())
+                            except Empty:
+                                break
+                        if not mels:
+                            continue
+
+                        # Silence gate: a near-constant mel carries no
+                        # speech, so answer those chunks with an empty
+                        # transcription and keep the NPU for the rest.
+                        silent = [float(mel.var()) < SILENCE_MEL_VARIANCE for mel in mels]
+                        active = [mel for mel, skip in zip(mels, silent) if not skip]
+
+                        slots = [encoder_slot(i) for i, _ in enumerate(active)]
+                        # preprocess already emits C-contiguous tensors in
+                        # the device layout, so bind directly.
+                        for (bindings, _), mel in zip(slots, active):
+                            bindings.input().set_buffer(mel)
+                        if slots:
+                            encoder_configured_infer_model.run(
+                                [bindings for bindings, _ in slots], self.timeout_ms
                             )
 
-                            generated_tokens = []
+                        slot_iter = iter(slots)
+                        for skip in silent:
+                            if skip:
+                                self.results_queue.put("")
+                                continue
+                            _, chunk_features = next(slot_iter)
+                            decoder_bindings.input(f"{decoder_model_name}/input_layer1").set_buffer(
+                                chunk_features
+                            )
 
-                            for i in range(self.decoding_sequence_length - 1):
-                                tokenized_ids = self._tokenization(
-                                    decoder_input_ids, add_embed=False
-                                )
+                            start_token_id = 50258
+                            # Unfilled positions carry token id 0 in the
+                            # original input-ids formulation, so prefill
+                            # every row with its embedding before placing
+                            # the start token.
+                            token_embeddings[0, 0] = self._embedding_row(0)
+                            token_embeddings[0, 0, 0] = self._embedding_row(start_token_id)
 
-                                decoder_bindings.input(
-                                    f"{decoder_model_name}/input_layer1"
-                                ).set_buffer(encoded_features)
-                                decoder_bindings.input(
-                                    f"{decoder_model_name}/input_layer2"
-                                ).set_buffer(tokenized_ids)
-
-                                buffers = [
-                                    np.zeros(decoder_infer_model.output(name).shape).astype(
-                                        np.float32
-                                    )
-                                    for name in sorted_output_names
-                                ]
-                                for name, buf in zip(sorted_output_names, buffers):
-                                    decoder_bindings.output(name).set_buffer(buf)
+                            generated_tokens = []
 
+                            for i in range(self.decoding_sequence_length - 1):
                                 decoder_configured_infer_model.run(
                                     [decoder_bindings], self.timeout_ms
                                 )
 
-                                decoder_outputs = np.concatenate(
-                                    [
-                                        decoder_bindings.output(name).get_buffer()
-                                        for name in useful_outputs
-                                    ],
-                                    axis=2,
-                                )
+                                for name, lo, hi in logit_slices:
+                                    step_logits[0, lo:hi] = decoder_output_buffers[name][0, i]
 
-                                repetition_penalty = 1.5
-                                logits = apply_repetition_penalty(
-                                    decoder_outputs[:, i],
+                                next_token = select_next_token(
+                                    step_logits,
                                     generated_tokens,
-                                    penalty=repetition_penalty,
+                                    boost_ids=self.boost_ids,
+                                    boost_factors=self.boost_factors,
+                                    penalty=1.5,
                                 )
-                                if self.boost_token_map:
-                                    logits = apply_word_boost(logits, self.boost_token_map)
-                                next_token = np.argmax(logits)
 
                                 generated_tokens.append(next_token)
-                                decoder_input_ids[0][i + 1] = np.array(
-                                    [[next_token]], dtype=np.int64
-                                )
+                                token_embeddings[0, 0, i + 1] = self._embedding_row(next_token)
 
                                 if next_token == self.tokenizer.eos_token_id:
                                     break
 
-                            transcription = self.tokenizer.decode(
-                                generated_tokens, skip_special_tokens=True
-                            )
-                            self.results_queue.put(transcription)
-                        except Empty:
-                            pass
+                            self.results_queue.put(self._decode_tokens(generated_tokens))
         finally:
             if owns_vdevice:
                 vdevice.release()
@@ -278,9 +468,18 @@ class HailoWhisperPipeline:
     def send_data(self, data):
         self.data_queue.put(data)
 
-    def get_transcription(self):
-        return self.results_queue.get()
+    def get_transcription(self, timeout=None):
+        """Block until a transcription is ready and return it.
+
+        The result queue wakes the caller the moment the inference thread
+        enqueues a result, so there is no need to poll or sleep between
+        send_data() and get_transcription(). Raises queue.Empty if no
+        result arrives within `timeout` seconds.
+        """
+        return self.results_queue.get(timeout=timeout)
 
     def stop(self):
         self.running = False
+        # Wake the inference thread if it is parked waiting for input.
+        self.data_queue.wake()
         self.thread.join()
@@ -1,4 +1,8 @@
-from lib.pipeline import HEF_REGISTRY, get_hef_paths
+import time
+from queue import Empty
+from threading import Thread
+
+from lib.pipeline import HEF_REGISTRY, _SpscRing, get_hef_paths
 
 
 class TestHefRegistry:
@@ -53,3 +57,74 @@ class TestGetHefPaths:
             assert False, "Should have raised"
         except FileNotFoundError as e:
             assert "not found" in str(e)
+
+
+class TestSpscRing:
+    def test_put_get_ordering(self):
+        ring = _SpscRing()
+        for i in range(5):
+            ring.put(i)
+        assert [ring.get_nowait() for _ in range(5)] == [0, 1, 2, 3, 4]
+
+    def test_empty_when_drained(self):
+        ring = _SpscRing()
+        ring.put("item")
+        assert ring.get_nowait() == "item"
+        try:
+            ring.get_nowait()
+            assert False, "Should have raised"
+        except Empty:
+            pass
+
+    def test_wraps_past_capacity(self):
+        ring = _SpscRing(capacity=4)
+        for i in range(10):
+            ring.put(i)
+            assert ring.get_nowait() == i
+
+    def test_put_blocks_until_slot_frees(self):
+        ring = _SpscRing(capacity=2)
+        ring.put(0)
+        ring.put(1)
+        producer = Thread(target=ring.put, args=(2,), daemon=True)
+        producer.start()
+        time.sleep(0.05)
+        assert producer.is_alive()  # full ring parks the producer in backoff
+        assert ring.get_nowait() == 0
+        producer.join(timeout=1.0)
+        assert not producer.is_alive()
+        assert ring.get_nowait() == 1
+        assert ring.get_nowait() == 2
+
+    def test_producer_consumer_burst(self):
+        # Hammers the clear/re-set protocol in get_nowait: a lost wakeup
+        # would strand the consumer in wait() and fail the join below.
+        ring = _SpscRing()
+        n = 5000
+        received = []
+
+        def consume():
+            while len(received) < n:
+                ring.wait()
+                while True:
+                    try:
+                        received.append(ring.get_nowait())
+                    except Empty:
+                        break
+
+        consumer = Thread(target=consume, daemon=True)
+        consumer.start()
+        for i in range(n):
+            ring.put(i)
+        consumer.join(timeout=10.0)
+        assert received == list(range(n))
+
+    def test_wake_unblocks_wait(self):
+        ring = _SpscRing()
+        waiter = Thread(target=ring.wait, daemon=True)
+        waiter.start()
+        time.sleep(0.05)
+        assert waiter.is_alive()  # parked: nothing was put
+        ring.wake()
+        waiter.join(timeout=1.0)
+        assert not waiter.is_alive()
@@ -4,22 +4,54 @@ import re
 import numpy as np
 
 excluded_tokens = [11, 13]  # Punctuation tokens to exclude from repetition penalty
+_excluded_tokens = np.array(excluded_tokens)
 
 
-def apply_repetition_penalty(logits, generated_tokens, penalty=1.5, last_window=8):
-    logits = np.squeeze(logits, axis=0)
-    recent_tokens = (
-        generated_tokens[-last_window:]
-        if len(generated_tokens) >= last_window
-        else generated_tokens
+def _penalize_recent(row, generated_tokens, penalty, last_window):
+    """Penalize recently generated tokens in the logit row, in place.
+
+    Sign-aware: positive logits shrink toward zero, negative ones are
+    pushed further down. Plain division would make an already-unlikely
+    (negative-logit) token *more* likely to repeat.
+    """
+    recent = np.setdiff1d(
+        np.asarray(generated_tokens[-last_window:], dtype=np.int64), _excluded_tokens
     )
-    recent_tokens = set(recent_tokens)
-    for token in recent_tokens:
-        if token not in excluded_tokens:
-            logits[token] /= penalty
+    vals = row[recent]
+    row[recent] = np.where(vals > 0, vals / penalty, vals * penalty)
+
+
+def apply_repetition_penalty(logits, generated_tokens, penalty=1.5, last_window=8):
+    # logits[0] is a view, so the update below reaches the caller's array
+    # without the allocation np.squeeze would cost per decode step.
+    logits = logits[0]
+    _penalize_recent(logits, generated_tokens, penalty, last_window)
     return logits
 
 
+def select_next_token(
+    logits,
+    generated_tokens,
+    boost_ids=None,
+    boost_factors=None,
+    penalty=1.5,
+    last_window=8,
+):
+    """Apply repetition penalty and word boost in place, then pick the argmax.
+
+    Fuses what used to be three separate calls per decode step into one:
+    the penalty and boost each touch only a handful of vocabulary entries,
+    so the single argmax is the only full pass over the ~50k logits.
+    boost_ids/boost_factors are parallel arrays precomputed once per run
+    (see HailoWhisperPipeline), already filtered of special tokens.
+    """
+    row = logits[0]
+    _penalize_recent(row, generated_tokens, penalty, last_window)
+    if boost_ids is not None:
+        row[boost_ids] *= boost_factors
+    return int(np.argmax(row))
+
+
 def apply_word_boost(logits, boost_token_map, special_token_start=50257):
     for token_id, boost_factor in boost_token_map.items():
         if token_id < special_token_start:
@@ -27,22 +59,43 @@ def apply_word_boost(logits, boost_token_map, special_token_start=50257):
     return logits
 
 
+_SENTENCE_SPLIT = re.compile(r"(?<=[.?])\s+")
+
+
 def clean_transcription(transcription):
-    sentences = re.split(r"(?<=[.?])\s+", transcription)
-    unique_sentences = []
-
-    for sentence in sentences:
-        for unique_sentence in unique_sentences:
-            normalized_current = sentence.lower().strip()
-            normalized_unique = unique_sentence.lower().strip()
-            if normalized_current in normalized_unique or normalized_unique in normalized_current:
-                cleaned_transcription = " ".join(unique_sentences)
-                if not cleaned_transcription.endswith((".", "?")):
-                    cleaned_transcription += "."
-                return cleaned_transcription
-        unique_sentences.append(sentence.strip())
-
-    cleaned_transcription = " ".join(unique_sentences)
+    """Deduplicate repeated sentences in a transcription.
+
+    Walks the whole transcription rather than stopping at the first
+    repeat, so real content after a mid-transcript stutter survives.
+    Exact repeats (the common Whisper failure mode) are caught by a set
+    in O(1); the containment scan handles partial repeats, keeping the
+    longer of the two sentences in place.
+    """
+    kept = []
+    kept_norm = []
+    seen = set()
+
+    for sentence in _SENTENCE_SPLIT.split(transcription):
+        sentence = sentence.strip()
+        normalized = sentence.lower()
+        if not normalized or normalized in seen:
+            continue
+        for i, norm in enumerate(kept_norm):
+            if normalized in norm:
+                break
+            if norm in normalized:
+                # A longer version of an earlier sentence — upgrade it.
+                seen.discard(norm)
+                seen.add(normalized)
+                kept[i] = sentence
+                kept_norm[i] = normalized
+                break
+        else:
+            kept.append(sentence)
+            kept_norm.append(normalized)
+            seen.add(normalized)
+
+    cleaned_transcription = " ".join(kept)
     if not cleaned_transcription.endswith((".", "?")):
         cleaned_transcription += "."
     return cleaned_transcription
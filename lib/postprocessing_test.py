@@ -1,6 +1,11 @@
 import numpy as np
 
-from lib.postprocessing import apply_repetition_penalty, apply_word_boost, clean_transcription
+from lib.postprocessing import (
+    apply_repetition_penalty,
+    apply_word_boost,
+    clean_transcription,
+    select_next_token,
+)
 
 
 class TestApplyRepetitionPenalty:
@@ -30,6 +35,13 @@ class TestApplyRepetitionPenalty:
         result = apply_repetition_penalty(logits, [], penalty=2.0)
         np.testing.assert_array_equal(result, [10.0, 20.0, 30.0])
 
+    def test_negative_logits_pushed_further_down(self):
+        # Dividing a negative logit would raise its probability; the
+        # penalty must multiply instead for tokens below zero.
+        logits = np.array([[10.0, -4.0, 30.0]])
+        result = apply_repetition_penalty(logits, [1], penalty=2.0)
+        assert result[1] == -8.0
+
 
 class TestApplyWordBoost:
     def test_multiplies_logits_for_boosted_tokens(self):
@@ -62,6 +74,28 @@ class TestApplyWordBoost:
         assert result[3] == 5.0
 
 
+class TestSelectNextToken:
+    def test_returns_argmax_without_modifiers(self):
+        logits = np.array([[1.0, 5.0, 3.0]])
+        assert select_next_token(logits, []) == 1
+
+    def test_penalizes_recent_tokens(self):
+        logits = np.array([[10.0, 20.0, 18.0]])
+        # Token 1 was just generated; halving drops it below token 2
+        assert select_next_token(logits, [1], penalty=2.0) == 2
+
+    def test_applies_boost_arrays(self):
+        logits = np.array([[10.0, 10.0, 10.0]])
+        boost_ids = np.array([2])
+        boost_factors = np.array([2.0], dtype=np.float32)
+        assert select_next_token(logits, [], boost_ids, boost_factors) == 2
+
+    def test_excluded_tokens_not_penalized(self):
+        logits = np.zeros((1, 14))
+        logits[0, 11] = 5.0
+        assert select_next_token(logits, [11], penalty=10.0) == 11
+
+
 class TestCleanTranscription:
     def test_deduplicates_repeated_sentences(self):
         result = clean_transcription("Hello world. Hello world. Goodbye.")
@@ -87,3 +121,12 @@ class TestCleanTranscription:
         result = clean_transcription("Hello. Hello world.")
         # "Hello" is contained in "Hello world", so dedup triggers
         assert "Hello" in result
+
+    def test_keeps_content_after_repeat(self):
+        result = clean_transcription("Hello world. Hello world. Goodbye.")
+        assert "Goodbye" in result
+
+    def test_trailing_partial_repeat_dropped(self):
+        # Trailing fragment of an already-kept sentence (no terminator)
+        result = clean_transcription("Hello world. Hello world")
+        assert result == "Hello world."
@@ -7,9 +7,28 @@
 #   3. Normalization    — RMS-based gain to bring speech to a consistent level
 #   4. Voice activity   — energy-based detection of where speech starts
 
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import noisereduce as nr
 import numpy as np
-from scipy.signal import butter, sosfilt
+from scipy.signal import butter, sosfilt, sosfilt_zi
+
+try:
+    # Optional: JIT-compiles the VAD energy scan into one typed loop with
+    # no temporaries. Everything works (slightly slower) without it.
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    # Optional single-pass SOS kernel; scipy's sosfilt walks the buffer
+    # once per biquad section.
+    from ._sosfilt_numba import sosfilt_f32
+except ImportError:
+    sosfilt_f32 = None
 
 from . import audio_utils
 
@@ -23,17 +42,54 @@ VOICE_LOW_HZ = 80
 VOICE_HIGH_HZ = 7500
 
 
+@lru_cache(maxsize=8)
+def _design_bandpass(sample_rate, low_hz, high_hz, order):
+    """Design the Butterworth sos coefficients for a given configuration.
+
+    Filter design involves LAPACK root finding and is far more expensive
+    than applying the filter; the parameters are effectively constant, so
+    the design is memoized.
+    """
+    nyquist = sample_rate / 2.0
+    low = low_hz / nyquist
+    high = min(high_hz / nyquist, 0.99)  # clamp below Nyquist to avoid filter instability
+    return butter(order, [low, high], btype="band", output="sos")
+
+
 def bandpass_filter(audio, sample_rate, low_hz=VOICE_LOW_HZ, high_hz=VOICE_HIGH_HZ, order=5):
     """Apply a Butterworth bandpass filter to isolate human voice frequencies.
 
     Uses a second-order sections (sos) representation for numerical stability,
     which matters on the 32-bit float audio we're working with.
     """
-    nyquist = sample_rate / 2.0
-    low = low_hz / nyquist
-    high = min(high_hz / nyquist, 0.99)  # clamp below Nyquist to avoid filter instability
-    sos = butter(order, [low, high], btype="band", output="sos")
-    return sosfilt(sos, audio).astype(np.float32)
+    sos = _design_bandpass(sample_rate, low_hz, high_hz, order)
+    if sosfilt_f32 is not None:
+        return sosfilt_f32(sos, np.ascontiguousarray(audio, dtype=np.float32))
+    return sosfilt(sos, audio).astype(np.float32, copy=False)
+
+
+class BandpassStream:
+    """Stateful bandpass filter for streaming audio frames.
+
+    bandpass_filter needs the whole utterance in memory, so filtering can
+    only start once capture has finished. This class carries the filter
+    state (sosfilt_zi) across calls, letting the same Butterworth filter
+    run frame by frame while the microphone is still recording — the
+    concatenated output is identical to filtering the full signal at once.
+    """
+
+    def __init__(self, sample_rate, low_hz=VOICE_LOW_HZ, high_hz=VOICE_HIGH_HZ, order=5):
+        self._sos = _design_bandpass(sample_rate, low_hz, high_hz, order)
+        self._zi = None
+
+    def push(self, frame):
+        """Filter one frame of audio, carrying filter state to the next call."""
+        if self._zi is None:
+            # Scale the steady-state initial conditions to the first sample
+            # to avoid a startup transient on non-zero-mean input.
+            self._zi = sosfilt_zi(self._sos) * frame[0]
+        filtered, self._zi = sosfilt(self._sos, frame, zi=self._zi)
+        return filtered.astype(np.float32, copy=False)
 
 
 # --- Noise reduction ---
@@ -72,19 +128,39 @@ def normalize_rms(audio, target_db=TARGET_RMS_DBFS):
     similar energy level. This is much more robust than the previous
     peak-amplitude gain boost.
     """
-    rms = np.sqrt(np.mean(audio**2))
-    if rms < 1e-8:
+    # audio @ audio is a single BLAS dot pass; audio**2 would materialize a
+    # full-length temporary just to sum it.
+    mean_square = float(audio @ audio) / audio.size
+    if mean_square < 1e-16:
         # Silence — nothing to normalize
         return audio
     target_rms = 10 ** (target_db / 20.0)
-    gain = target_rms / rms
+    gain = target_rms / math.sqrt(mean_square)
     audio = audio * gain
-    # Clip to [-1, 1] to prevent overflow when converting to int16 later
-    return np.clip(audio, -1.0, 1.0).astype(np.float32)
+    # Clip to [-1, 1] in place to prevent overflow when converting to int16 later
+    np.clip(audio, -1.0, 1.0, out=audio)
+    return audio
 
 
 # --- Voice activity detection ---
 
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _frame_energy(audio, frame_size):
+        n_frames = audio.shape[0] // frame_size
+        energy = np.empty(n_frames, dtype=np.float32)
+        for i in range(n_frames):
+            acc = 0.0
+            base = i * frame_size
+            for j in range(frame_size):
+                sample = audio[base + j]
+                acc += sample * sample
+            energy[i] = acc / frame_size
+        return energy
+else:
+    _frame_energy = None
+
 
 def detect_first_speech(audio_data, sample_rate, threshold=0.2, frame_duration=0.02):
     """Find the timestamp (in seconds) where speech first appears.
@@ -94,19 +170,33 @@ def detect_first_speech(audio_data, sample_rate, threshold=0.2, frame_duration=0
     exceeds the threshold. Returns None if no speech is found.
     """
     if len(audio_data.shape) == 2:
-        audio_data = np.mean(audio_data, axis=1)
+        # Reduce in float32 — np.mean's float64 accumulator would double
+        # the memory traffic and hand back an array needing a down-cast.
+        channels = audio_data.shape[1]
+        audio_data = np.add.reduce(audio_data, axis=1, dtype=np.float32)
+        audio_data *= np.float32(1.0 / channels)
 
     frame_size = int(frame_duration * sample_rate)
-    frames = [audio_data[i : i + frame_size] for i in range(0, len(audio_data), frame_size)]
-    energy = [np.sum(np.abs(frame) ** 2) / len(frame) for frame in frames]
-
-    max_energy = max(energy)
+    n = len(audio_data) - (len(audio_data) % frame_size)
+    if n == 0:
+        return None
+
+    if _frame_energy is not None:
+        energy = _frame_energy(np.ascontiguousarray(audio_data[:n], dtype=np.float32), frame_size)
+    else:
+        # Reshape into a (frames, frame_size) view and reduce each row with
+        # one fused multiply-accumulate, instead of slicing and summing each
+        # frame in a Python loop.
+        frames = audio_data[:n].reshape(-1, frame_size)
+        energy = np.einsum("ij,ij->i", frames, frames) / frame_size
+
+    max_energy = energy.max()
     if max_energy > 0:
-        energy = [e / max_energy for e in energy]
+        energy /= max_energy
 
-    for i, e in enumerate(energy):
-        if e > threshold:
-            return round(i * frame_duration, 1)
+    idx = int(np.argmax(energy > threshold))
+    if energy[idx] > threshold:
+        return round(idx * frame_duration, 1)
 
     return None
 
@@ -129,9 +219,8 @@ def improve_input_audio(audio, sample_rate=audio_utils.SAMPLE_RATE, vad=True):
 
     start_time = 0
     if vad:
+        # None means no speech detected — the caller handles that case.
         start_time = detect_first_speech(audio, sample_rate, threshold=0.2, frame_duration=0.02)
-        if start_time is None:
-            pass  # No speech detected — caller handles this
 
     return audio, start_time
 
@@ -144,9 +233,11 @@ def preprocess(audio, is_nhwc=False, chunk_length=10, chunk_offset=0, max_durati
 
     Whisper's encoder expects mel spectrograms of a fixed duration (the
     chunk_length, typically 10s or 30s depending on the HEF model).
-    This function slices the audio into those chunks, pads the last one
-    if needed, and converts each to a log-mel spectrogram in the tensor
-    layout the Hailo model expects.
+    This generator slices the audio into those chunks, pads the last one
+    if needed, and yields each as a log-mel spectrogram in the tensor
+    layout the Hailo model expects. Yielding one chunk at a time lets the
+    caller submit chunks to the NPU while later ones are still being
+    computed, overlapping CPU preprocessing with inference.
 
     Args:
         is_nhwc: If True, output tensors in NHWC layout (Hailo convention).
@@ -164,19 +255,41 @@ def preprocess(audio, is_nhwc=False, chunk_length=10, chunk_offset=0, max_durati
     step = int(segment_samples * (1 - overlap))
 
     audio = audio[offset:max_samples]
-    mel_spectrograms = []
-
-    for start in range(0, len(audio), step):
-        if start >= len(audio):
-            break
-        end = int(start + segment_samples)
-        chunk = audio[start:end]
-        chunk = audio_utils.pad_or_trim(chunk, int(segment_duration * sample_rate))
-        mel = audio_utils.log_mel_spectrogram(chunk).to("cpu")
+    if len(audio) == 0:
+        return
+
+    # Run the STFT once over the whole (padded) signal; each chunk is then
+    # just a frame-index slice of the shared power spectrogram. This avoids
+    # one FFT pass per chunk and recomputing overlap regions when
+    # overlap > 0. Only the log scaling stays per chunk, since it is
+    # normalized against each chunk's own maximum.
+    n_chunks = -(-len(audio) // step)
+    padded_samples = (n_chunks - 1) * step + int(segment_samples)
+    audio = audio_utils.pad_or_trim(audio, padded_samples)
+    full_mel = audio_utils.mel_power_spectrogram(audio)
+
+    frames_per_chunk = int(segment_samples) // audio_utils.HOP_LENGTH
+
+    def finalize_chunk(start_frame):
+        chunk_mel = full_mel[:, start_frame : start_frame + frames_per_chunk]
+        mel = audio_utils.log_normalize(chunk_mel).numpy()
         mel = np.expand_dims(mel, axis=0)
         mel = np.expand_dims(mel, axis=2)
         if is_nhwc:
-            mel = np.transpose(mel, [0, 2, 3, 1])
-        mel_spectrograms.append(mel)
-
-    return mel_spectrograms
+            # Copy into the target layout here, where the access pattern is
+            # known, rather than handing the pipeline a non-contiguous view
+            # it would have to copy again before binding.
+            mel = np.ascontiguousarray(mel.transpose(0, 2, 3, 1))
+        return mel
+
+    start_frames = [i * step // audio_utils.HOP_LENGTH for i in range(n_chunks)]
+    if n_chunks == 1:
+        yield finalize_chunk(start_frames[0])
+        return
+
+    # The per-chunk log scaling and layout copies are independent and the
+    # torch ops release the GIL, so finalize chunks across cores while
+    # yielding in order — the caller gets the first chunk as soon as it is
+    # ready and later ones finish in the background.
+    with ThreadPoolExecutor(max_workers=min(n_chunks, os.cpu_count() or 1)) as executor:
+        yield from executor.map(finalize_chunk, start_frames)
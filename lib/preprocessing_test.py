@@ -1,6 +1,8 @@
 import numpy as np
+import pytest
 
 from lib.preprocessing import (
+    BandpassStream,
     bandpass_filter,
     detect_first_speech,
     improve_input_audio,
@@ -34,6 +36,29 @@ class TestBandpassFilter:
         assert len(filtered) == len(audio)
 
 
+class TestBandpassStream:
+    def test_chunked_matches_single_push(self):
+        audio = np.random.randn(SAMPLE_RATE).astype(np.float32) * 0.1
+        whole = BandpassStream(SAMPLE_RATE).push(audio)
+        stream = BandpassStream(SAMPLE_RATE)
+        frame_size = 320  # 20 ms
+        chunked = np.concatenate(
+            [stream.push(audio[i : i + frame_size]) for i in range(0, len(audio), frame_size)]
+        )
+        np.testing.assert_allclose(chunked, whole, atol=1e-6)
+
+    def test_attenuates_low_frequency(self):
+        t = np.linspace(0, 1.0, SAMPLE_RATE, dtype=np.float32)
+        tone_30hz = np.sin(2 * np.pi * 30 * t).astype(np.float32)
+        filtered = BandpassStream(SAMPLE_RATE).push(tone_30hz)
+        assert np.sqrt(np.mean(filtered**2)) < 0.1
+
+    def test_returns_float32(self):
+        stream = BandpassStream(SAMPLE_RATE)
+        frame = np.random.randn(320).astype(np.float32)
+        assert stream.push(frame).dtype == np.float32
+
+
 class TestNormalizeRms:
     def test_normalizes_to_target(self):
         audio = np.random.randn(SAMPLE_RATE).astype(np.float32) * 0.01
@@ -83,6 +108,22 @@ class TestDetectFirstSpeech:
         assert onset is not None
 
 
+class TestFrameEnergyKernel:
+    def test_matches_einsum_reference(self):
+        # The njit kernel replaces the einsum path when numba is present;
+        # both must compute the same per-frame mean-square energy.
+        pytest.importorskip("numba")
+        from lib.preprocessing import _frame_energy
+
+        frame_size = 320
+        audio = np.random.default_rng(0).standard_normal(SAMPLE_RATE).astype(np.float32)
+        n = len(audio) - (len(audio) % frame_size)
+        frames = audio[:n].reshape(-1, frame_size)
+        expected = np.einsum("ij,ij->i", frames, frames) / frame_size
+        result = _frame_energy(np.ascontiguousarray(audio[:n]), frame_size)
+        np.testing.assert_allclose(result, expected, rtol=1e-4)
+
+
 class TestReduceNoise:
     def test_returns_float32_same_length(self):
         audio = np.random.randn(SAMPLE_RATE).astype(np.float32) * 0.1
@@ -119,16 +160,15 @@ class TestImproveInputAudio:
 
 
 class TestPreprocess:
-    def test_returns_list_of_spectrograms(self):
+    def test_yields_spectrograms(self):
         # 10 seconds of audio at 16kHz
         audio = np.random.randn(SAMPLE_RATE * 10).astype(np.float32) * 0.1
-        result = preprocess(audio, chunk_length=10)
-        assert isinstance(result, list)
+        result = list(preprocess(audio, chunk_length=10))
         assert len(result) >= 1
 
     def test_spectrogram_shape_nchw(self):
         audio = np.random.randn(SAMPLE_RATE * 10).astype(np.float32) * 0.1
-        result = preprocess(audio, is_nhwc=False, chunk_length=10)
+        result = list(preprocess(audio, is_nhwc=False, chunk_length=10))
         mel = result[0]
         # NCHW: (1, 80, 1, time_frames)
         assert mel.shape[0] == 1
@@ -137,7 +177,7 @@ class TestPreprocess:
 
     def test_spectrogram_shape_nhwc(self):
         audio = np.random.randn(SAMPLE_RATE * 10).astype(np.float32) * 0.1
-        result = preprocess(audio, is_nhwc=True, chunk_length=10)
+        result = list(preprocess(audio, is_nhwc=True, chunk_length=10))
         mel = result[0]
         # NHWC: (1, 1, time_frames, 80)
         assert mel.shape[0] == 1
@@ -147,12 +187,12 @@ class TestPreprocess:
     def test_chunk_offset_skips_audio(self):
         # 20 seconds of audio, skip first 10
         audio = np.random.randn(SAMPLE_RATE * 20).astype(np.float32) * 0.1
-        full = preprocess(audio, chunk_length=10)
-        skipped = preprocess(audio, chunk_length=10, chunk_offset=10)
+        full = list(preprocess(audio, chunk_length=10))
+        skipped = list(preprocess(audio, chunk_length=10, chunk_offset=10))
         assert len(skipped) < len(full)
 
     def test_multiple_chunks(self):
         # 25 seconds of audio with 10s chunks — should produce multiple chunks
         audio = np.random.randn(SAMPLE_RATE * 25).astype(np.float32) * 0.1
-        result = preprocess(audio, chunk_length=10)
+        result = list(preprocess(audio, chunk_length=10))
         assert len(result) >= 2
@@ -1,9 +1,11 @@
 import os
+import selectors
 import signal
 import sys
 import time
 import warnings
 from itertools import cycle
+from math import lcm
 from threading import Event, Thread
 
 SPINNER_CHARS = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
@@ -34,9 +36,38 @@ def _build_text_frames(text):
     return frames
 
 
+class _SelectableEvent(Event):
+    """Event whose timed wait parks in a single select() syscall.
+
+    Event.wait(timeout) is a Python-level Condition loop that takes the
+    GIL on every timed wake; backing the spinner's tick wait with an
+    eventfd keeps the idle cadence a pure syscall, so the animation
+    thread doesn't contend with GIL-holding C work on the main thread.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._fd = os.eventfd(0, os.EFD_NONBLOCK)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._fd, selectors.EVENT_READ)
+
+    def set(self):
+        super().set()
+        os.eventfd_write(self._fd, 1)
+
+    def wait_tick(self, timeout):
+        """Sleep up to timeout seconds, waking immediately on set()."""
+        self._selector.select(timeout)
+        return self.is_set()
+
+    def close(self):
+        self._selector.close()
+        os.close(self._fd)
+
+
 def spinner(message):
     """Start a spinner on a background thread. Returns (done_event, thread)."""
-    done = Event()
+    done = _SelectableEvent()
     thread = Thread(target=_spin, args=(message, done), daemon=True)
     thread.start()
     return done, thread
@@ -57,19 +88,27 @@ def loading(message, func, done_message=None, spin_message=None):
     n_frames = len(frames)
     n_spin = len(SPINNER_CHARS)
 
+    # Render every (spinner char, text frame) combination to bytes up
+    # front — one full animation period — so the child's loop is just
+    # os.write() + sleep with no per-tick formatting or UTF-8 encoding.
+    period = lcm(n_spin * 2, n_frames)
+    rendered = [
+        b"\r" + SPINNER_CHARS[i // 2 % n_spin].encode() + b" " + frames[i % n_frames].encode()
+        for i in range(period)
+    ]
+
     # Safe to fork: child only does os.write() and time.sleep(), no shared state.
     with warnings.catch_warnings():
         warnings.simplefilter("ignore", DeprecationWarning)
         pid = os.fork()
     if pid == 0:
-        i = 0
         try:
-            while True:
-                spin = SPINNER_CHARS[i // 2 % n_spin]
-                text = frames[i % n_frames]
-                os.write(1, f"\r{spin} {text}".encode())
-                time.sleep(0.04)
-                i += 1
+            # 20 fps — still smooth for a sweep animation, and each frame
+            # is a single write() of one prerendered buffer, so the child
+            # costs 20 syscalls/sec for however long the model load runs.
+            for buf in cycle(rendered):
+                os.write(1, buf)
+                time.sleep(0.05)
         except BaseException:
             pass
         os._exit(0)
@@ -87,11 +126,14 @@ def loading(message, func, done_message=None, spin_message=None):
 
 
 def _spin(message, done):
+    wait = done.wait_tick if isinstance(done, _SelectableEvent) else done.wait
     for char in cycle(SPINNER_CHARS):
         if done.is_set():
             break
         sys.stdout.write(f"\r{char} {message}")
         sys.stdout.flush()
-        done.wait(0.08)
+        wait(0.08)
     sys.stdout.write("\r\033[K")
     sys.stdout.flush()
+    if isinstance(done, _SelectableEvent):
+        done.close()
@@ -1,11 +1,9 @@
 """Piper TTS wrapper — synthesize speech and play via sounddevice."""
 
-import io
 import os
 import queue
 import re
 import threading
-import wave
 from contextlib import redirect_stderr
 from io import StringIO
 from math import gcd
@@ -36,25 +34,87 @@ def _suppress_native_stderr(func):
 DEFAULT_VOICE = "en_US-amy-medium"
 
 
+# One alternation covering every markdown feature the old per-feature
+# re.sub chain handled: links (keeping the label), bold/italic markers,
+# code backticks, headers, and noisy symbols (replaced by a space).
+_MARKDOWN_RE = re.compile(
+    r"\[(?P<label>[^\]]+)\]\([^)]+\)"
+    r"|(?P<strip>[*_]{1,3}|`+|^#+\s*)"
+    r"|(?P<symbol>[~@^|\\<>{}\[\]#])",
+    re.MULTILINE,
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Every character that can begin a _MARKDOWN_RE match. LLM replies are
+# mostly plain prose; a C-level membership scan lets those skip the
+# alternation entirely.
+_MARKDOWN_CHARS = frozenset("*_`#[]~@^|\\<>{}")
+
+
+def _markdown_repl(match):
+    if match.lastgroup == "symbol":
+        return " "
+    label = match.group("label")
+    if label is not None:
+        # Link labels can themselves carry markdown (e.g. [**x**](url)).
+        return _MARKDOWN_RE.sub(_markdown_repl, label)
+    return ""
+
+
 def clean_text_for_tts(text):
     """Clean text for TTS synthesis.
 
-    Strips markdown formatting and noisy characters that cause artifacts.
+    Strips markdown formatting and noisy characters that cause artifacts,
+    in a single scan over the text rather than one full pass per feature.
     Adapted from hailo-apps voice assistant.
     """
-    # Remove markdown bold/italic
-    text = re.sub(r"[*_]{1,3}", "", text)
-    # Remove code backticks
-    text = re.sub(r"`+", "", text)
-    # Remove headers
-    text = re.sub(r"^#+\s*", "", text, flags=re.MULTILINE)
-    # Convert links [text](url) -> text
-    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
-    # Remove noisy symbols
-    text = re.sub(r"[~@^|\\<>{}\[\]#]", " ", text)
-    # Normalize whitespace
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    if _MARKDOWN_CHARS.intersection(text):
+        text = _MARKDOWN_RE.sub(_markdown_repl, text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def resample_stream(chunks, up, down):
+    """Resample a stream of float32 chunks by up/down as they arrive.
+
+    Running resample_poly on each chunk independently would put filter
+    edge transients (audible clicks) at every chunk boundary. Instead each
+    chunk is resampled together with a stretch of its neighbours covering
+    the filter's half-length, and the output for that context is dropped —
+    the overlap-save trick. Context boundaries are kept on multiples of
+    `down` so every piece lands on the same polyphase grid, making the
+    concatenated output sample-exact with resampling the whole signal in
+    one call.
+    """
+    # resample_poly's default filter has 10 * max(up, down) taps per side
+    # at the upsampled rate; round the equivalent input-sample span up to
+    # a multiple of down.
+    half = 10 * max(up, down) // up + 1
+    ctx = -(-half // down) * down
+
+    pos = 0  # absolute input position where `carry + chunk` starts
+    emitted = 0  # absolute output samples yielded so far
+    carry = np.empty(0, dtype=np.float32)
+    for chunk in chunks:
+        x = np.concatenate([carry, chunk])
+        # Hold back the last ctx input samples — their output still needs
+        # right-context from the next chunk.
+        emit_end = pos + len(x) - ctx
+        if len(x) < 2 * ctx + down or emit_end * up // down <= emitted:
+            # Too short to resample with context on both sides — accumulate.
+            carry = x
+            continue
+        y = resample_poly(x, up, down).astype(np.float32, copy=False)
+        base = pos * up // down
+        yield y[emitted - base : emit_end * up // down - base]
+        emitted = emit_end * up // down
+        # Keep ctx of left-context before the held-back region, aligned to
+        # the polyphase grid.
+        new_pos = (emit_end - ctx) // down * down
+        carry = x[new_pos - pos :]
+        pos = new_pos
+    if len(carry):
+        y = resample_poly(carry, up, down).astype(np.float32, copy=False)
+        yield y[emitted - pos * up // down :]
 
 
 class PiperTTS:
@@ -74,6 +134,7 @@ class PiperTTS:
 
         self._audio_queue = queue.Queue()
         self._audio_buf = np.empty(0, dtype=np.float32)
+        self._buf_pos = 0
         self._done_event = threading.Event()
         self._stream = sd.OutputStream(
             samplerate=self.playback_rate,
@@ -108,16 +169,23 @@ class PiperTTS:
         written = 0
 
         while written < needed:
-            # Drain current buffer
-            if len(self._audio_buf) > 0:
-                chunk = min(len(self._audio_buf), needed - written)
-                outdata[written : written + chunk, 0] = self._audio_buf[:chunk]
-                self._audio_buf = self._audio_buf[chunk:]
+            # Drain current buffer. Consumption is tracked with an integer
+            # cursor rather than rebinding a shrinking slice — this runs on
+            # PortAudio's realtime thread, where per-call view allocation is
+            # avoidable churn.
+            remaining = len(self._audio_buf) - self._buf_pos
+            if remaining > 0:
+                chunk = min(remaining, needed - written)
+                outdata[written : written + chunk, 0] = self._audio_buf[
+                    self._buf_pos : self._buf_pos + chunk
+                ]
+                self._buf_pos += chunk
                 written += chunk
             else:
                 # Try to get more audio from the queue
                 try:
                     self._audio_buf = self._audio_queue.get_nowait()
+                    self._buf_pos = 0
                 except queue.Empty:
                     # No audio left — fill remainder with silence
                     outdata[written:, 0] = 0.0
@@ -125,44 +193,66 @@ class PiperTTS:
                     return
 
     def synthesize(self, text):
-        """Synthesize text to a float32 numpy array at the model's native sample rate."""
+        """Synthesize text to a float32 numpy array at the model's native sample rate.
+
+        Reads Piper's raw int16 PCM stream directly instead of having it
+        encode a WAV into a BytesIO and parsing that straight back — the
+        old round trip serialized and re-parsed the same samples twice.
+        """
         text = clean_text_for_tts(text)
         if not text.strip():
             return np.array([], dtype=np.float32)
 
-        wav_buffer = io.BytesIO()
-        with wave.open(wav_buffer, "wb") as wf:
-            with redirect_stderr(StringIO()):
-                self.voice.synthesize_wav(text, wf)
-
-        wav_buffer.seek(0)
-        with wave.open(wav_buffer, "rb") as wf:
-            data = wf.readframes(wf.getnframes())
-            width = wf.getsampwidth()
-
-        if width == 2:
-            audio = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
-        else:
-            audio = np.frombuffer(data, dtype=np.float32)
+        with redirect_stderr(StringIO()):
+            chunks = [
+                np.frombuffer(pcm, dtype=np.int16) for pcm in self.voice.synthesize_stream_raw(text)
+            ]
+        if not chunks:
+            return np.array([], dtype=np.float32)
 
+        audio = np.concatenate(chunks).astype(np.float32)
+        audio *= np.float32(1.0 / 32768.0)
         return audio
 
+    def _pcm_chunks(self, text):
+        """Yield Piper's raw PCM stream as float32 chunks."""
+        with redirect_stderr(StringIO()):
+            for pcm in self.voice.synthesize_stream_raw(text):
+                chunk = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+                chunk *= np.float32(1.0 / 32768.0)
+                yield chunk
+
     def speak(self, text):
-        """Synthesize text and play via the persistent stream (blocking)."""
-        audio = self.synthesize(text)
-        if len(audio) == 0:
-            return
+        """Synthesize text and play via the persistent stream (blocking).
 
-        if self._resample_up is not None:
-            audio = resample_poly(audio, self._resample_up, self._resample_down).astype(np.float32)
+        Piper yields audio chunk by chunk; each chunk is resampled and
+        queued as it arrives, so playback of the first words overlaps
+        with synthesis of the rest of the utterance instead of waiting
+        for the whole thing.
+        """
+        text = clean_text_for_tts(text)
+        if not text.strip():
+            return
 
         # Pad 300ms of silence before speech so any audio pipeline transition
         # glitch (HDMI/PipeWire first-audio latency) doesn't eat real speech.
-        pad = np.zeros(int(self.playback_rate * 0.3), dtype=np.float32)
-        audio = np.concatenate([pad, audio])
-
+        queued = False
+        chunks = self._pcm_chunks(text)
+        if self._resample_up is not None:
+            chunks = resample_stream(chunks, self._resample_up, self._resample_down)
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+            if not queued:
+                self._audio_queue.put(np.zeros(int(self.playback_rate * 0.3), dtype=np.float32))
+                queued = True
+            self._audio_queue.put(chunk)
+
+        if not queued:
+            return
+        # The callback may have set the event during a synthesis stall; it
+        # re-arms on its next pass once the queue is truly drained.
         self._done_event.clear()
-        self._audio_queue.put(audio)
         self._done_event.wait()
 
     def close(self):
@@ -1,4 +1,7 @@
-from lib.tts import clean_text_for_tts
+import numpy as np
+from scipy.signal import resample_poly
+
+from lib.tts import clean_text_for_tts, resample_stream
 
 
 class TestCleanTextForTts:
@@ -48,3 +51,47 @@ class TestCleanTextForTts:
         assert "Bold" in result
         assert "italic" in result
         assert "a link" in result
+
+
+class TestResampleStream:
+    def _stream(self, signal, n_cuts, up, down, seed=0):
+        rng = np.random.default_rng(seed)
+        cuts = np.sort(rng.choice(np.arange(1, len(signal)), n_cuts, replace=False))
+        chunks = np.split(signal, cuts)
+        return np.concatenate(list(resample_stream(iter(chunks), up, down)))
+
+    def test_matches_one_shot_resample(self):
+        # 22050 Hz Piper audio to a 48 kHz sink: up=320, down=147
+        rng = np.random.default_rng(1)
+        signal = rng.standard_normal(22050).astype(np.float32)
+        ref = resample_poly(signal, 320, 147).astype(np.float32)
+        out = self._stream(signal, 13, 320, 147)
+        assert out.shape == ref.shape
+        np.testing.assert_array_equal(out, ref)
+
+    def test_matches_when_downsampling(self):
+        rng = np.random.default_rng(2)
+        signal = rng.standard_normal(20000).astype(np.float32)
+        ref = resample_poly(signal, 147, 320).astype(np.float32)
+        out = self._stream(signal, 7, 147, 320)
+        assert out.shape == ref.shape
+        np.testing.assert_array_equal(out, ref)
+
+    def test_tiny_chunks_accumulate(self):
+        # Chunks far smaller than the filter context must still splice exactly
+        rng = np.random.default_rng(3)
+        signal = rng.standard_normal(4000).astype(np.float32)
+        chunks = np.split(signal, range(50, len(signal), 50))
+        out = np.concatenate(list(resample_stream(iter(chunks), 320, 147)))
+        ref = resample_poly(signal, 320, 147).astype(np.float32)
+        np.testing.assert_array_equal(out, ref)
+
+    def test_single_chunk(self):
+        rng = np.random.default_rng(4)
+        signal = rng.standard_normal(5000).astype(np.float32)
+        out = np.concatenate(list(resample_stream(iter([signal]), 2, 1)))
+        ref = resample_poly(signal, 2, 1).astype(np.float32)
+        np.testing.assert_array_equal(out, ref)
+
+    def test_empty_stream(self):
+        assert list(resample_stream(iter([]), 320, 147)) == []
@@ -3,11 +3,18 @@
 
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from lib.spinner import loading
 
+_HERE = os.path.dirname(os.path.abspath(__file__))
 
-def parse_args():
+# Built lazily and reused — repeated parse_args calls (tests, reloads)
+# skip rebuilding the argparse action graph.
+_parser = None
+
+
+def _build_parser():
     parser = argparse.ArgumentParser(description="Speech-to-text using Whisper on Hailo AI HAT+")
     parser.add_argument(
         "--variant",
@@ -35,9 +42,7 @@ def parse_args():
         default=[],
         help="Boost a word during decoding. Format: word:factor (default factor 1.5). Repeatable.",
     )
-    default_boost_file = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "boost_words.json"
-    )
+    default_boost_file = os.path.join(_HERE, "boost_words.json")
     parser.add_argument(
         "--boost-file",
         type=str,
@@ -67,23 +72,23 @@ def parse_args():
         default=None,
         help="Override the default LLM system prompt",
     )
-    return parser.parse_args()
+    return parser
 
 
-def main():
-    args = parse_args()
+def parse_args():
+    global _parser
+    if _parser is None:
+        _parser = _build_parser()
+    return _parser.parse_args()
 
-    # Create TTS first so the audio stream warms up during heavy Hailo imports
-    tts = None
-    if not args.no_tts:
 
-        def _load_tts():
-            from lib.tts import PiperTTS
+def main():
+    args = parse_args()
 
-            models_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "piper")
-            return PiperTTS(models_dir, args.tts_voice)
+    def _load_tts():
+        from lib.tts import PiperTTS
 
-        tts = loading("TTS voice", _load_tts)
+        return PiperTTS(os.path.join(_HERE, "models", "piper"), args.tts_voice)
 
     def _import():
         from lib.app import run
@@ -91,7 +96,21 @@ def main():
 
         return run, load_boost_words
 
-    run, load_boost_words = loading("tools", _import)
+    # The Piper voice load and the heavy Hailo/torch imports touch disjoint
+    # resources, so run them concurrently — startup costs the slower of the
+    # two instead of their sum, and the TTS audio stream still starts as
+    # early as possible to warm the HDMI sink.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        tts_future = None if args.no_tts else executor.submit(_load_tts)
+        tools_future = executor.submit(_import)
+
+        def _await_startup():
+            tools = tools_future.result()
+            return tools, tts_future.result() if tts_future else None
+
+        (run, load_boost_words), tts = loading(
+            "tools", _await_startup, spin_message="Loading...", done_message="Loaded."
+        )
 
     boost_words = load_boost_words(args.boost_file, args.boost)
 